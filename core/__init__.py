@@ -1,13 +1,14 @@
 """AdWave Test Tools Core Module"""
 from .config import Config, LLMConfig
 from .browser_agent import AdWaveBrowserAgent, create_llm
-from .reporter import TestReport, TestResult, ReportGenerator
+from .reporter import Status, TestReport, TestResult, ReportGenerator
 
 __all__ = [
     "Config",
     "LLMConfig",
     "AdWaveBrowserAgent",
     "create_llm",
+    "Status",
     "TestReport",
     "TestResult",
     "ReportGenerator",
@@ -5,9 +5,10 @@ Supports multiple LLM providers: OpenAI-compatible, Claude, Gemini.
 """
 import os
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Literal
+from typing import Optional, Dict, Literal, Sequence
 
 # Fix Windows console encoding
 if sys.platform == "win32":
@@ -23,6 +24,7 @@ from .prompts import (
     build_create_campaign_task,
     build_create_audience_task,
     build_create_creative_task,
+    build_create_creatives_task,
     build_delete_creatives_task,
     build_single_flow_registration_task,
 )
@@ -36,6 +38,21 @@ MAIN_492x328 = ASSETS_DIR / "main_492x328.png"
 # Ad format types
 AdFormatType = Literal["Push", "Pop", "Display", "Native"]
 
+# Ad formats that have creatives (Pop does not)
+CREATIVE_AD_FORMATS: tuple[AdFormatType, ...] = ("Push", "Display", "Native")
+
+
+def _creative_asset_paths(ad_format: AdFormatType) -> Dict[str, str]:
+    """Asset paths to upload for an ad format (upload step prompt arguments)."""
+    if ad_format == "Push":
+        return {"icon_path": str(ICON_192x192), "main_path": str(MAIN_492x328)}
+    elif ad_format == "Display":
+        return {"image_path": str(DISPLAY_250x250)}
+    elif ad_format == "Native":
+        return {"image_path": str(MAIN_492x328)}
+    else:
+        raise ValueError(f"Unknown ad format: {ad_format}")
+
 
 def create_llm(llm_config: LLMConfig):
     """Create an LLM instance based on the provider configuration."""
@@ -91,14 +108,24 @@ def create_llm(llm_config: LLMConfig):
 class AdWaveBrowserAgent:
     """Browser Use agent wrapper for AdWave testing."""
 
-    def __init__(self, config: Config, headless: bool = True):
+    def __init__(
+        self,
+        config: Config,
+        headless: bool = True,
+        reuse_browser: bool = False,
+        user_data_dir: Optional[str] = None,
+    ):
         self.config = config
         self.headless = headless
+        # Keep one browser (and its login session) alive across tasks
+        self.reuse_browser = reuse_browser
+        self._shared_browser: Optional[Browser] = None
         self._current_agent: Optional[Agent] = None
         self._last_screenshot: Optional[bytes] = None
         self._last_result: Optional[str] = None
         self._last_prompt: Optional[str] = None  # Store prompt for checkpoint extraction
         self._final_screenshot: Optional[bytes] = None  # Screenshot on success
+        self.last_llm_call_ts: Optional[float] = None  # time.monotonic() when the last LLM task ended
 
         # Track if using local model (requires simplified Agent settings)
         self._is_local_model = config.llm_config.provider == "ollama"
@@ -111,9 +138,13 @@ class AdWaveBrowserAgent:
         # Set viewport to 1080p for all modes
         viewport = {"width": 1920, "height": 1080}
 
+        # Only pass user_data_dir when set: an explicit None makes browser-use create
+        # one temp profile for this BrowserProfile, shared by every browser built from it
+        profile_kwargs = {"user_data_dir": user_data_dir} if user_data_dir else {}
         self.browser_profile = BrowserProfile(
             headless=headless,
             viewport=viewport,
+            **profile_kwargs,
         )
 
         # Initialize Gmail helper for registration tests (if configured)
@@ -127,6 +158,28 @@ class AdWaveBrowserAgent:
         else:
             self.gmail_helper = None
 
+    async def close_browser(self) -> None:
+        """Shut down the shared browser kept alive by reuse_browser (no-op otherwise)."""
+        browser, self._shared_browser = self._shared_browser, None
+        if browser is not None:
+            try:
+                await browser.kill()
+                print("Shared browser closed")
+            except Exception:
+                pass
+
+    def reset_state(self) -> None:
+        """
+        Clear per-test state so the agent can be reused by the next test.
+
+        The LLM client, browser profile and Gmail helper are kept.
+        """
+        self._current_agent = None
+        self._last_screenshot = None
+        self._last_result = None
+        self._last_prompt = None
+        self._final_screenshot = None
+
     async def capture_screenshot(self) -> Optional[bytes]:
         """Capture a screenshot of the current browser state."""
         try:
@@ -172,13 +225,22 @@ class AdWaveBrowserAgent:
         agent_kwargs = {
             "task": task,
             "llm": self.llm,
-            "browser_profile": self.browser_profile,
             "sensitive_data": sensitive_data,
             "max_steps": max_steps,
             "available_file_paths": available_file_paths,
             "step_timeout": step_timeout,
         }
 
+        if self.reuse_browser:
+            # Start the shared browser on first use; later tasks keep its pages and cookies
+            if self._shared_browser is None:
+                self._shared_browser = Browser(
+                    browser_profile=self.browser_profile.model_copy(update={"keep_alive": True})
+                )
+            agent_kwargs["browser"] = self._shared_browser
+        else:
+            agent_kwargs["browser_profile"] = self.browser_profile
+
         # Apply simplified settings for local models
         if self._is_local_model:
             agent_kwargs.update({
@@ -235,13 +297,17 @@ class AdWaveBrowserAgent:
 
             # Clean up browser session to ensure next test starts fresh
             try:
-                if self._current_agent and self._current_agent.browser_session:
+                if self.reuse_browser:
+                    await self.close_browser()
+                elif self._current_agent and self._current_agent.browser_session:
                     await self._current_agent.browser_session.close()
                     print("Browser session closed")
             except Exception:
                 pass
 
             raise
+        finally:
+            self.last_llm_call_ts = time.monotonic()
 
     async def create_campaign(
         self,
@@ -337,35 +403,48 @@ class AdWaveBrowserAgent:
         self.config.validate()
 
         # Prepare file paths based on ad format
-        if ad_format == "Push":
-            file_paths = [str(ICON_192x192), str(MAIN_492x328)]
-            task = build_create_creative_task(
-                login_url=self.config.login_url,
-                ad_format=ad_format,
-                icon_path=str(ICON_192x192),
-                main_path=str(MAIN_492x328),
-            )
-        elif ad_format == "Display":
-            file_paths = [str(DISPLAY_250x250)]
-            task = build_create_creative_task(
-                login_url=self.config.login_url,
-                ad_format=ad_format,
-                image_path=str(DISPLAY_250x250),
-            )
-        elif ad_format == "Native":
-            file_paths = [str(MAIN_492x328)]
-            task = build_create_creative_task(
-                login_url=self.config.login_url,
-                ad_format=ad_format,
-                image_path=str(MAIN_492x328),
-            )
-        else:
-            raise ValueError(f"Unknown ad format: {ad_format}")
+        asset_paths = _creative_asset_paths(ad_format)
+        task = build_create_creative_task(
+            login_url=self.config.login_url,
+            ad_format=ad_format,
+            **asset_paths,
+        )
 
         return await self.run_task(
             task,
             sensitive_data=self.config.credentials,
             max_steps=30,
+            available_file_paths=list(asset_paths.values()),
+        )
+
+    async def create_creatives(
+        self,
+        ad_formats: Sequence[AdFormatType] = CREATIVE_AD_FORMATS,
+    ) -> str:
+        """
+        Upload one creative per ad format in a single task (one login and navigation).
+
+        Args:
+            ad_formats: Ad formats to upload, in order (default: Push, Display, Native)
+
+        Returns:
+            Result string from the browser agent, with counts before the
+            first upload and after the last one
+        """
+        self.config.validate()
+
+        creatives = {ad_format: _creative_asset_paths(ad_format) for ad_format in ad_formats}
+        file_paths = sorted({path for asset_paths in creatives.values() for path in asset_paths.values()})
+
+        task = build_create_creatives_task(
+            login_url=self.config.login_url,
+            creatives=creatives,
+        )
+
+        return await self.run_task(
+            task,
+            sensitive_data=self.config.credentials,
+            max_steps=30 + 20 * (len(creatives) - 1),
             available_file_paths=file_paths,
         )
 
@@ -489,6 +568,7 @@ class AdWaveBrowserAgent:
             )
 
         finally:
+            self.last_llm_call_ts = time.monotonic()
             try:
                 await browser.close()
             except Exception:
@@ -20,7 +20,8 @@ import socket
 import time
 from datetime import datetime
 from email.header import decode_header
-from typing import Optional
+from email.message import Message
+from typing import Dict, List, Optional
 
 # Try to import socks for proxy support
 try:
@@ -29,6 +30,9 @@ try:
 except ImportError:
     SOCKS_AVAILABLE = False
 
+# UID in a FETCH response, e.g. b"1 (UID 42 RFC822 {1234}"
+_UID_RE = re.compile(rb'UID (\d+)')
+
 
 class GmailHelper:
     """Helper class to read emails via IMAP for registration verification."""
@@ -72,6 +76,11 @@ class GmailHelper:
             self.proxy_host = "127.0.0.1"
             self.proxy_port = 7897
 
+        # Logged-in IMAP connection and parsed messages (by UID), kept across
+        # calls so retries don't reconnect or re-download the mailbox
+        self._mail: Optional[imaplib.IMAP4_SSL] = None
+        self._messages: Dict[bytes, Message] = {}
+
     def _create_imap_connection(self):
         """
         Create IMAP connection, using SOCKS proxy if available.
@@ -87,6 +96,58 @@ class GmailHelper:
 
         return imaplib.IMAP4_SSL(self.imap_server)
 
+    def _get_connection(self) -> imaplib.IMAP4_SSL:
+        """
+        Return the open IMAP connection with INBOX selected, reconnecting if needed.
+
+        Returns:
+            Logged-in IMAP4_SSL connection
+        """
+        if self._mail is not None:
+            try:
+                self._mail.noop()
+                return self._mail
+            except (imaplib.IMAP4.error, OSError):
+                self._mail = None
+
+        mail = self._create_imap_connection()
+        mail.login(self.email_address, self.app_password)
+        mail.select("inbox")
+        self._mail = mail
+        return mail
+
+    def _fetch_messages(self, mail: imaplib.IMAP4_SSL, uids: List[bytes]) -> None:
+        """Download the given UIDs in a single FETCH and add them to the message cache."""
+        missing = [uid for uid in uids if uid not in self._messages]
+        if not missing:
+            return
+        _, msg_data = mail.uid("FETCH", b",".join(missing).decode(), "(RFC822)")
+        for i, item in enumerate(msg_data):
+            if not isinstance(item, tuple):
+                continue
+            # Servers may send UID before the message literal ("1 (UID 42 RFC822 {n}")
+            # or after it, in the next item (b" UID 42)")
+            uid_match = _UID_RE.search(item[0])
+            if uid_match is None and i + 1 < len(msg_data) and isinstance(msg_data[i + 1], bytes):
+                uid_match = _UID_RE.search(msg_data[i + 1])
+            if uid_match:
+                uid = uid_match.group(1)
+            elif len(missing) == 1:
+                uid = missing[0]
+            else:
+                print(f"  Skipping fetched email without UID: {item[0][:60]!r}")
+                continue
+            self._messages[uid] = email.message_from_bytes(item[1])
+
+    def close(self) -> None:
+        """Log out of the shared IMAP connection (no-op if not connected)."""
+        mail, self._mail = self._mail, None
+        if mail is not None:
+            try:
+                mail.logout()
+            except Exception:
+                pass
+
     def generate_alias(self, suffix: Optional[str] = None) -> str:
         """
         Generate a unique email alias using Gmail's '+' feature.
@@ -122,6 +183,10 @@ class GmailHelper:
         After successful extraction, marks the email as read to prevent
         re-processing in future test runs.
 
+        The IMAP connection and downloaded emails are kept on the helper, so
+        later calls (e.g. a retried registration) only fetch new emails.
+        Call close() when done.
+
         Args:
             alias_email: The alias email address to check (used for To: header matching)
             timeout: Maximum seconds to wait for email
@@ -132,9 +197,6 @@ class GmailHelper:
         Returns:
             Extracted verification code, or empty string if not found within timeout
         """
-        mail = self._create_imap_connection()
-        mail.login(self.email_address, self.app_password)
-
         # Use override time if provided (should be set before Phase 1 starts)
         search_start_time = start_time_override if start_time_override else datetime.now()
         start_time = time.time()
@@ -143,25 +205,26 @@ class GmailHelper:
         print(f"Search started at: {search_start_time.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"Sender filter: {sender_filter}")
 
-        try:
-            mail.select("inbox")
-
-            while time.time() - start_time < timeout:
+        while time.time() - start_time < timeout:
+            try:
+                mail = self._get_connection()
 
                 # Search for emails from today (don't require UNSEEN - email might be auto-read)
                 # Using SINCE filter to limit to recent emails
                 today_str = search_start_time.strftime("%d-%b-%Y")
-                _, messages = mail.search(None, f'(SINCE "{today_str}")')
+                _, messages = mail.uid("SEARCH", None, f'(SINCE "{today_str}")')
 
                 message_ids = messages[0].split()
                 if message_ids:
                     print(f"Found {len(message_ids)} email(s) from today, checking...")
 
+                # Only emails not seen by an earlier poll are downloaded
+                self._fetch_messages(mail, message_ids)
+
                 for msg_num in message_ids:
-                    # Fetch email with FLAGS to check/modify read status
-                    _, msg_data = mail.fetch(msg_num, "(RFC822)")
-                    email_body = msg_data[0][1]
-                    msg = email.message_from_bytes(email_body)
+                    msg = self._messages.get(msg_num)
+                    if msg is None:
+                        continue
 
                     # Get email metadata for logging
                     sender = msg.get("From", "").lower()
@@ -224,7 +287,7 @@ class GmailHelper:
                             continue
 
                         # Mark email as read (SEEN) to prevent re-processing
-                        mail.store(msg_num, '+FLAGS', '\\Seen')
+                        mail.uid("STORE", msg_num, '+FLAGS', '\\Seen')
                         print(f"  Email marked as read")
 
                         return code
@@ -234,18 +297,17 @@ class GmailHelper:
                         print(f"  No verification code found in email body")
                         print(f"  Body preview: {body_preview}...")
 
-                time.sleep(poll_interval)
-                elapsed = int(time.time() - start_time)
-                print(f"Waiting for verification email... ({elapsed}s / {timeout}s)")
+            except (imaplib.IMAP4.abort, OSError) as e:
+                # Dropped connection: reconnect on the next poll
+                print(f"IMAP connection lost ({e}), reconnecting...")
+                self._mail = None
 
-            print(f"✗ Timeout waiting for verification email after {timeout}s")
-            return ""
+            time.sleep(poll_interval)
+            elapsed = int(time.time() - start_time)
+            print(f"Waiting for verification email... ({elapsed}s / {timeout}s)")
 
-        finally:
-            try:
-                mail.logout()
-            except Exception:
-                pass
+        print(f"✗ Timeout waiting for verification email after {timeout}s")
+        return ""
 
     def _parse_email_date(self, date_str: str) -> Optional[datetime]:
         """
@@ -11,6 +11,7 @@ LOGIN = """
 STEP {step}: Login
 - Go to {login_url}
 - Wait for the login page to fully load
+- If you are redirected to the campaign page instead, you are already logged in: skip to the next step
 - Enter {{email}} in the email input field
 - Enter {{password}} in the password input field
 - Click the "Login" button to submit the form
@@ -347,6 +348,13 @@ STOP: After clicking "Add", the upload is COMPLETE. Do NOT use upload_file again
 CHECKPOINT: Creative should be added successfully
 """
 
+CREATE_CREATIVES_BATCH = """
+You will upload {count} creatives in this session, one after another: {ad_formats}.
+- The upload_file limits in each upload step apply to that step only
+- After each "Add", wait for the creatives list before starting the next creative
+- Count the creatives (BEFORE_COUNT) only once, before the first upload
+"""
+
 VERIFY_CREATIVE_UPLOAD = """
 STEP {step}: Verify Upload Success
 - After clicking "Add", wait for redirect back to creatives list
@@ -409,35 +417,52 @@ def build_delete_creatives_task(
     return task
 
 
-def build_create_creative_task(
-    login_url: str,
+def _creative_upload_step(
+    step: int,
     ad_format: str,
     icon_path: str = "",
     main_path: str = "",
     image_path: str = "",
 ) -> str:
-    """Build complete prompt for uploading a creative."""
-
-    # Select upload step based on ad format
+    """Build the upload step for one ad format."""
     if ad_format == "Push":
-        upload_step = UPLOAD_CREATIVE_PUSH.format(
-            step=5,
+        return UPLOAD_CREATIVE_PUSH.format(
+            step=step,
             icon_path=icon_path,
             main_path=main_path,
         )
     elif ad_format == "Display":
-        upload_step = UPLOAD_CREATIVE_DISPLAY.format(
-            step=5,
+        return UPLOAD_CREATIVE_DISPLAY.format(
+            step=step,
             image_path=image_path,
         )
     elif ad_format == "Native":
-        upload_step = UPLOAD_CREATIVE_NATIVE.format(
-            step=5,
+        return UPLOAD_CREATIVE_NATIVE.format(
+            step=step,
             image_path=image_path,
         )
     else:
         raise ValueError(f"Unknown ad format: {ad_format}")
 
+
+def build_create_creative_task(
+    login_url: str,
+    ad_format: str,
+    icon_path: str = "",
+    main_path: str = "",
+    image_path: str = "",
+) -> str:
+    """Build complete prompt for uploading a creative."""
+
+    # Select upload step based on ad format
+    upload_step = _creative_upload_step(
+        5,
+        ad_format,
+        icon_path=icon_path,
+        main_path=main_path,
+        image_path=image_path,
+    )
+
     task = (
         LOGIN.format(step=1, login_url=login_url) +
         NAVIGATE_TO_CREATIVES.format(step=2) +
@@ -450,6 +475,37 @@ def build_create_creative_task(
     return task
 
 
+def build_create_creatives_task(
+    login_url: str,
+    creatives: dict[str, dict[str, str]],
+) -> str:
+    """
+    Build prompt for uploading several creatives in one task (one login).
+
+    Args:
+        login_url: Login page URL
+        creatives: Ad format -> asset paths (icon_path/main_path/image_path),
+            uploaded in order
+    """
+    task = (
+        CREATE_CREATIVES_BATCH.format(count=len(creatives), ad_formats=", ".join(creatives)) +
+        LOGIN.format(step=1, login_url=login_url) +
+        NAVIGATE_TO_CREATIVES.format(step=2)
+    )
+
+    # Each creative takes three steps: start, choose format, upload
+    step = 3
+    for ad_format, asset_paths in creatives.items():
+        task += (
+            CREATE_CREATIVE_START.format(step=step) +
+            CHOOSE_AD_FORMAT.format(step=step + 1, ad_format=ad_format) +
+            _creative_upload_step(step + 2, ad_format, **asset_paths)
+        )
+        step += 3
+
+    return task + VERIFY_CREATIVE_UPLOAD.format(step=step)
+
+
 # =============================================================================
 # Registration Steps (Multi-step Wizard)
 # =============================================================================
@@ -3,36 +3,117 @@ Test report generator for AdWave tests.
 Generates HTML reports with screenshots and AI error analysis.
 Supports email and Slack delivery.
 """
+import io
 import os
 import re
 import json
 import base64
+import hashlib
 import smtplib
 import urllib.request
 import urllib.error
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from email.mime.base import MIMEBase
-from email import encoders
+from email.mime.image import MIMEImage
+from email.charset import Charset, QP
+from email import policy as email_policy
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Literal, Sequence, Tuple
+from dataclasses import dataclass, field, asdict
+from functools import lru_cache
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import IntEnum
 
 
 # Reports directory
 REPORTS_DIR = Path(__file__).parent.parent / "reports"
 REPORTS_DIR.mkdir(exist_ok=True)
 
+# Patterns used by the helper functions at the bottom of this module
+_PROMPT_STEP_RE = re.compile(r'STEP\s+(\d+):\s*([^\n]+)', re.IGNORECASE)  # "STEP {n}: {description}"
+_STEP_NUM_RE = re.compile(r'(?:STEP|Step|step)\s*(\d+)')
+_LOWER_STEP_NUM_RE = re.compile(r'(?:step|STEP)\s*(\d+)')
+# Lookahead so overlapping keywords are all reported, like separate `in` checks
+_ERR_KEYWORD_RE = re.compile(
+    r'(?=(timeout|not found|not visible|login|auth|upload|file|click|network|connection|element))'
+)
+_PRIORITY_RE = re.compile(r'error|failed|exception|timeout|not found|assert', re.IGNORECASE)
+
+# Screenshots are written next to the report, in this subdirectory
+SHOTS_DIRNAME = "shots"
+
+# Inline screenshot encodings ("a85" needs the decoder script below)
+ScreenshotEncoding = Literal["b64", "a85"]
+# How generate_html references screenshots: shots file, Content-ID or inline encoding
+ImageMode = Literal["file", "cid", "b64", "a85"]
+
+# Browsers have no native base85 data URIs, so a85 screenshots are stored in
+# <script> blocks and turned into blob URLs on load. "<" is never emitted in
+# the payload (it is swapped for the unused "v") so it cannot close the block.
+A85_DECODER_JS = """
+<script>
+document.querySelectorAll("img[data-a85]").forEach(function (img) {
+    var payload = document.getElementById("a85-" + img.dataset.a85);
+    if (!payload) return;  // Screenshot file was missing; the alt text is shown
+    var s = payload.textContent
+        .replace(/v/g, "<").replace(/z/g, "!!!!!");
+    var pad = (5 - s.length % 5) % 5;
+    s += "uuuu".slice(0, pad);
+    var out = new Uint8Array(s.length / 5 * 4), o = 0;
+    for (var i = 0; i < s.length; i += 5) {
+        var v = 0;
+        for (var j = 0; j < 5; j++) v = v * 85 + s.charCodeAt(i + j) - 33;
+        out[o++] = v / 16777216 & 255; out[o++] = v >>> 16 & 255;
+        out[o++] = v >>> 8 & 255; out[o++] = v & 255;
+    }
+    img.src = URL.createObjectURL(new Blob([out.subarray(0, o - pad)], {type: "image/png"}));
+});
+</script>
+"""
 
-@dataclass
+# Per-module and per-result HTML fragments for generate_html()
+_MODULE_OPEN_TMPL = '''
+            <div class="module">
+                <h3>{icon} {name}</h3>
+                <ul>
+'''
+_MODULE_CLOSE_HTML = '''
+                </ul>
+            </div>
+'''
+_LI_TMPL = '''
+                    <li class="test-result {cls}">
+                        <div class="test-header">
+                            {icon} <code>{name}</code> <span class="duration">({dur:.1f}s)</span>
+                        </div>
+                        {checkpoints}
+                        {error}
+                        {success}
+                    </li>
+'''
+
+
+class Status(IntEnum):
+    """Status of a test result or checkpoint."""
+    PASSED = 0
+    FAILED = 1
+    ERROR = 2
+    SKIPPED = 3
+
+
+# Statuses counted as failures
+_FAIL_SET = frozenset({Status.FAILED, Status.ERROR})
+
+
+@dataclass(slots=True)
 class Checkpoint:
     """Represents a test checkpoint/step."""
     step: int
     name: str
-    status: str  # "passed", "failed", "in_progress"
+    status: Status  # PASSED, FAILED or SKIPPED
     details: str = ""
-    screenshot_base64: Optional[str] = None
+    screenshot_url: Optional[str] = None  # Relative to the report directory
 
 
 @dataclass
@@ -40,14 +121,31 @@ class TestResult:
     """Individual test result."""
     name: str
     module: str
-    status: str  # "passed", "failed", "error"
+    status: Status  # PASSED, FAILED or ERROR
     duration: float
     error_message: str = ""
     error_analysis: Optional[str] = None  # AI-generated error analysis
-    screenshot_base64: Optional[str] = None  # Error screenshot
-    final_screenshot_base64: Optional[str] = None  # Success screenshot
+    screenshot_url: Optional[str] = None  # Error screenshot (relative to report dir)
+    final_screenshot_url: Optional[str] = None  # Success screenshot (relative to report dir)
     checkpoints: List[Checkpoint] = field(default_factory=list)
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-type copy (statuses as ints), e.g. to send from a pytest-xdist worker."""
+        data = asdict(self)
+        data["status"] = int(self.status)
+        for checkpoint in data["checkpoints"]:
+            checkpoint["status"] = int(checkpoint["status"])
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TestResult":
+        """Rebuild a TestResult from to_dict() output."""
+        checkpoints = [
+            Checkpoint(**{**checkpoint, "status": Status(checkpoint["status"])})
+            for checkpoint in data.get("checkpoints", ())
+        ]
+        return cls(**{**data, "status": Status(data["status"]), "checkpoints": checkpoints})
+
 
 @dataclass
 class TestReport:
@@ -66,11 +164,11 @@ class TestReport:
 
     @property
     def passed_tests(self) -> int:
-        return len([r for r in self.results if r.status == "passed"])
+        return len([r for r in self.results if r.status is Status.PASSED])
 
     @property
     def failed_tests(self) -> int:
-        return len([r for r in self.results if r.status in ("failed", "error")])
+        return len([r for r in self.results if r.status in _FAIL_SET])
 
     @property
     def pass_rate(self) -> float:
@@ -86,16 +184,168 @@ class TestReport:
 class ReportGenerator:
     """Generates HTML test reports with email support."""
 
-    def __init__(self, output_dir: str = "reports"):
+    def __init__(
+        self,
+        output_dir: str = "reports",
+        inline_screenshots: bool = False,
+        screenshot_encoding: ScreenshotEncoding = "b64",
+    ):
+        """
+        Args:
+            output_dir: Directory for HTML reports and their screenshots
+            inline_screenshots: Embed screenshots in the HTML (single-file report)
+                instead of referencing files in the shots directory
+            screenshot_encoding: Encoding for inline screenshots. "a85" is ~6%
+                smaller than "b64" but needs JavaScript to display. Emails
+                always use Content-ID attachments.
+        """
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.shots_dir = self.output_dir / SHOTS_DIRNAME
+        self.inline_screenshots = inline_screenshots
+        self.screenshot_encoding = screenshot_encoding
+        # Screenshot files are written in the background (see save_screenshot)
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._pending_writes: Dict[Path, Future] = {}
+        if inline_screenshots and screenshot_encoding == "a85":
+            # First call builds the base85 lookup tables; pay it up front
+            base64.a85encode(b"\x00")
+
+    def save_screenshot(self, screenshot: bytes | str) -> str:
+        """
+        Queue screenshot for writing to the shots directory and return its relative URL.
+
+        The file is written on a background thread so test hooks never block
+        on disk I/O; call flush_screenshots() before reading it back
+        (generate_html does). Accepts raw PNG bytes or the base64 string browser-use returns, so
+        callers never keep an encoded copy around. Files are named by content
+        hash, so identical screenshots are only written once.
+        """
+        screenshot_bytes = base64.b64decode(screenshot) if isinstance(screenshot, str) else screenshot
+        digest = hashlib.blake2b(screenshot_bytes, digest_size=16).hexdigest()
+        filepath = self.shots_dir / f"{digest}.png"
+        if filepath not in self._pending_writes and not filepath.exists():
+            if self._writer is None:
+                self.shots_dir.mkdir(parents=True, exist_ok=True)
+                self._writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="screenshot-writer")
+            self._pending_writes[filepath] = self._writer.submit(filepath.write_bytes, screenshot_bytes)
+        return f"{SHOTS_DIRNAME}/{filepath.name}"
+
+    def flush_screenshots(self) -> None:
+        """Wait for background screenshot writes to finish."""
+        for filepath, future in self._pending_writes.items():
+            try:
+                future.result()
+            except OSError as e:
+                print(f"Failed to save screenshot {filepath.name}: {e}")
+        self._pending_writes.clear()
+
+    def _encode_screenshot(self, url: str, encoding: ScreenshotEncoding) -> Optional[str]:
+        """Read a saved screenshot and encode it for inline embedding (None if unreadable)."""
+        try:
+            data = (self.output_dir / url).read_bytes()
+        except OSError as e:
+            # Missing screenshot should not block the report
+            print(f"Screenshot {url} unavailable: {e}")
+            return None
+        if encoding == "a85":
+            return base64.a85encode(data).decode("ascii").replace("<", "v")
+        return base64.b64encode(data).decode("ascii")
+
+    def _img_tag(self, url: str, alt: str, img_mode: ImageMode) -> str:
+        """Build the <img> tag for a screenshot (file path, Content-ID or inline data)."""
+        if img_mode == "cid":
+            return f'<img src="cid:{Path(url).stem}" alt="{alt}">'
+        if img_mode == "file":
+            return f'<img src="{url}" alt="{alt}">'
+        if img_mode == "a85":
+            return f'<img data-a85="{Path(url).stem}" alt="{alt}">'
+        data = self._encode_screenshot(url, "b64")
+        if data is None:
+            return f'<em>{alt} unavailable</em>'
+        return f'<img src="data:image/png;base64,{data}" alt="{alt}">'
+
+    def _a85_payloads_html(self, report: TestReport) -> str:
+        """Emit the base85 screenshot payloads and the script that decodes them."""
+        parts = []
+        for url in self._screenshot_urls(report):
+            data = self._encode_screenshot(url, "a85")
+            if data is not None:  # Missing screenshots keep only their alt text
+                parts.append(f'<script type="text/x-a85" id="a85-{Path(url).stem}">{data}</script>\n')
+        payloads = "".join(parts)
+        return payloads + A85_DECODER_JS if payloads else ""
+
+    def _screenshot_urls(self, report: TestReport) -> List[str]:
+        """Collect the unique screenshot URLs rendered by generate_html()."""
+        urls: Dict[str, None] = {}
+        for result in report.results:
+            for cp in result.checkpoints:
+                if cp.screenshot_url:
+                    urls[cp.screenshot_url] = None
+            if result.status is not Status.PASSED and result.screenshot_url:
+                urls[result.screenshot_url] = None
+            if result.status is Status.PASSED and result.final_screenshot_url:
+                urls[result.final_screenshot_url] = None
+        return list(urls)
+
+    def _error_html(self, result: TestResult, img_mode: ImageMode) -> str:
+        """Build the error message, AI analysis and screenshot block of a failed test."""
+        error_html = ""
+        if result.error_message:
+            error_html += f'<div class="error-msg"><strong>Error:</strong><pre>{result.error_message[:500]}</pre></div>'
+        if result.error_analysis:
+            error_html += f'<div class="error-analysis"><strong>AI Analysis:</strong><p>{result.error_analysis}</p></div>'
+        if result.screenshot_url:
+            error_html += f'''
+                        <div class="error-screenshot">
+                            <strong>Error Screenshot:</strong>
+                            {self._img_tag(result.screenshot_url, "Error Screenshot", img_mode)}
+                        </div>
+                        '''
+        return error_html
+
+    def _final_screenshot_html(self, result: TestResult, img_mode: ImageMode) -> str:
+        """Build the final verification screenshot block of a passed test."""
+        if not result.final_screenshot_url:
+            return ""
+        return f'''
+                    <details open>
+                        <summary>✅ Final Verification Screenshot</summary>
+                        {self._img_tag(result.final_screenshot_url, "Final Screenshot", img_mode)}
+                    </details>
+                    '''
+
+    def generate_html(
+        self,
+        report: TestReport,
+        cid_images: bool = False,
+        generated_at: Optional[str] = None,
+        embed_images: bool = False,
+    ) -> str:
+        """
+        Generate HTML report content in markdown-like style.
 
-    def screenshot_to_base64(self, screenshot_bytes: bytes) -> str:
-        """Convert screenshot bytes to base64 string."""
-        return base64.b64encode(screenshot_bytes).decode("utf-8")
+        Screenshots are referenced by their relative URL. With cid_images=True
+        they are referenced by Content-ID instead, for use in email bodies.
+        With embed_images=True they are embedded as base64 data URIs, giving a
+        self-contained file (e.g. an email attachment).
+        generated_at is the footer timestamp (defaults to now).
+        """
+        if generated_at is None:
+            generated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        img_mode: ImageMode
+        if cid_images:
+            img_mode = "cid"
+        elif embed_images:
+            img_mode = "b64"
+        elif self.inline_screenshots:
+            img_mode = self.screenshot_encoding
+        else:
+            img_mode = "file"
 
-    def generate_html(self, report: TestReport) -> str:
-        """Generate HTML report content in markdown-like style."""
+        # Inline and Content-ID screenshots are read back from disk
+        self.flush_screenshots()
 
         # Group results by module
         modules = {}
@@ -105,88 +355,70 @@ class ReportGenerator:
             modules[result.module].append(result)
 
         # Generate test results by module
-        results_html = ""
+        results_parts = []
+        add_part = results_parts.append  # Bound once; called per module and per result
         for module_name, results in modules.items():
-            module_passed = all(r.status == "passed" for r in results)
+            module_passed = all(r.status is Status.PASSED for r in results)
             module_icon = "🟢" if module_passed else "🔴"
 
-            results_html += f'''
-            <div class="module">
-                <h3>{module_icon} {module_name}</h3>
-                <ul>
-            '''
+            add_part(_MODULE_OPEN_TMPL.format(icon=module_icon, name=module_name))
 
             for result in results:
-                status_icon = "✅" if result.status == "passed" else "❌"
-                duration_str = f"({result.duration:.1f}s)"
+                passed = result.status is Status.PASSED
 
                 # Checkpoints section
                 checkpoints_html = ""
                 if result.checkpoints:
-                    checkpoints_html = '<div class="checkpoints"><strong>Checkpoints:</strong><ul>'
+                    checkpoint_parts = ['<div class="checkpoints"><strong>Checkpoints:</strong><ul>']
                     for cp in result.checkpoints:
-                        if cp.status == "passed":
+                        if cp.status is Status.PASSED:
                             cp_icon = "✅"
-                        elif cp.status == "failed":
+                        elif cp.status is Status.FAILED:
                             cp_icon = "❌"
                         else:  # skipped
                             cp_icon = "⏭️"
                         cp_screenshot = ""
-                        if cp.screenshot_base64:
+                        if cp.screenshot_url:
                             cp_screenshot = f'''
                             <details>
                                 <summary>Screenshot</summary>
-                                <img src="data:image/png;base64,{cp.screenshot_base64}" alt="Step {cp.step}">
+                                {self._img_tag(cp.screenshot_url, f"Step {cp.step}", img_mode)}
                             </details>
                             '''
-                        checkpoints_html += f'''
+                        checkpoint_parts.append(f'''
                         <li>{cp_icon} Step {cp.step}: {cp.name}
                             {f'<span class="cp-details">- {cp.details}</span>' if cp.details else ''}
                             {cp_screenshot}
                         </li>
-                        '''
-                    checkpoints_html += '</ul></div>'
-
-                # Error section for failed tests
-                error_html = ""
-                if result.status != "passed":
-                    if result.error_message:
-                        error_html += f'<div class="error-msg"><strong>Error:</strong><pre>{result.error_message[:500]}</pre></div>'
-                    if result.error_analysis:
-                        error_html += f'<div class="error-analysis"><strong>AI Analysis:</strong><p>{result.error_analysis}</p></div>'
-                    if result.screenshot_base64:
-                        error_html += f'''
-                        <div class="error-screenshot">
-                            <strong>Error Screenshot:</strong>
-                            <img src="data:image/png;base64,{result.screenshot_base64}" alt="Error Screenshot">
-                        </div>
-                        '''
+                        ''')
+                    checkpoint_parts.append('</ul></div>')
+                    checkpoints_html = "".join(checkpoint_parts)
+
+                # Error details only for failed tests, final screenshot only for passed ones
+                if passed:
+                    error_html = ""
+                    success_screenshot_html = self._final_screenshot_html(result, img_mode)
+                else:
+                    error_html = self._error_html(result, img_mode)
+                    success_screenshot_html = ""
 
-                # Success screenshot
-                success_screenshot_html = ""
-                if result.status == "passed" and result.final_screenshot_base64:
-                    success_screenshot_html = f'''
-                    <details open>
-                        <summary>✅ Final Verification Screenshot</summary>
-                        <img src="data:image/png;base64,{result.final_screenshot_base64}" alt="Final Screenshot">
-                    </details>
-                    '''
+                add_part(_LI_TMPL.format_map({
+                    "cls": "passed" if passed else "failed",
+                    "icon": "✅" if passed else "❌",
+                    "name": result.name,
+                    "dur": result.duration,
+                    "checkpoints": checkpoints_html,
+                    "error": error_html,
+                    "success": success_screenshot_html,
+                }))
 
-                results_html += f'''
-                    <li class="test-result {'passed' if result.status == 'passed' else 'failed'}">
-                        <div class="test-header">
-                            {status_icon} <code>{result.name}</code> <span class="duration">{duration_str}</span>
-                        </div>
-                        {checkpoints_html}
-                        {error_html}
-                        {success_screenshot_html}
-                    </li>
-                '''
+            add_part(_MODULE_CLOSE_HTML)
 
-            results_html += '''
-                </ul>
-            </div>
-            '''
+        results_html = "".join(results_parts)
+
+        inline_data_html = ""
+        if img_mode == "a85":
+            inline_data_html = self._a85_payloads_html(report)
 
         html = f'''<!DOCTYPE html>
 <html lang="en">
@@ -386,20 +618,21 @@ class ReportGenerator:
 
     <hr>
     <div class="footer">
-        Generated by AdWave Test Tools | {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        Generated by AdWave Test Tools | {generated_at}
     </div>
-</body>
+{inline_data_html}</body>
 </html>'''
         return html
 
     def save_report(self, report: TestReport, filename: Optional[str] = None) -> str:
         """Save report to HTML file and return the path."""
+        now = datetime.now()
         if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             filename = f"test_report_{timestamp}.html"
 
         filepath = self.output_dir / filename
-        html = self.generate_html(report)
+        html = self.generate_html(report, generated_at=now.strftime("%Y-%m-%d %H:%M:%S"))
 
         with open(filepath, "w", encoding="utf-8") as f:
             f.write(html)
@@ -437,7 +670,7 @@ class ReportGenerator:
             from_email = smtp_user
 
         # Create message
-        msg = MIMEMultipart("alternative")
+        msg = MIMEMultipart("alternative", policy=email_policy.SMTP)
         msg["Subject"] = f"AdWave Test Report - {report.pass_rate:.1f}% Pass Rate ({report.passed_tests}/{report.total_tests})"
         msg["From"] = from_email
         msg["To"] = to_email
@@ -463,26 +696,40 @@ See attached HTML report for details.
         # Attach plain text
         msg.attach(MIMEText(plain_text, "plain"))
 
-        # Attach HTML report
-        html_content = self.generate_html(report)
-        msg.attach(MIMEText(html_content, "html"))
+        # Attach HTML report, with screenshots as inline Content-ID images
+        generated_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        html_content = self.generate_html(report, cid_images=True, generated_at=generated_at)
+        html_part = MIMEMultipart("related")
+        html_charset = Charset("utf-8")
+        html_charset.body_encoding = QP  # Mostly-ASCII markup: QP is far smaller than base64
+        html_part.attach(MIMEText(html_content, "html", html_charset))
+        for url in self._screenshot_urls(report):
+            try:
+                with open(self.output_dir / url, "rb") as f:
+                    image = MIMEImage(f.read(), "png")
+            except OSError:
+                continue  # Missing screenshot should not block the report
+            image.add_header("Content-ID", f"<{Path(url).stem}>")
+            image.add_header("Content-Disposition", "inline", filename=Path(url).name)
+            html_part.attach(image)
+        msg.attach(html_part)
 
-        # Also attach as file
-        with open(report_path, "rb") as f:
-            attachment = MIMEBase("application", "octet-stream")
-            attachment.set_payload(f.read())
-            encoders.encode_base64(attachment)
+        try:
+            # Also attach as a self-contained file (screenshots embedded, as the body's
+            # cid: images don't resolve outside this email). QP keeps lines under
+            # the SMTP limit without base64-encoding the markup
+            attachment_html = self.generate_html(report, generated_at=generated_at, embed_images=True)
+            attachment = MIMEText(attachment_html, "html", html_charset)
             attachment.add_header(
                 "Content-Disposition",
                 f"attachment; filename={Path(report_path).name}",
             )
             msg.attach(attachment)
 
-        # Send email
-        try:
+            # Send email
             with smtplib.SMTP_SSL(smtp_server, smtp_port) as server:
                 server.login(smtp_user, smtp_password)
-                server.sendmail(from_email, to_email, msg.as_string())
+                server.send_message(msg, from_addr=from_email, to_addrs=[to_email])
             print(f"Report sent to {to_email}")
             return True
         except Exception as e:
@@ -569,7 +816,7 @@ See attached HTML report for details.
 
         for result in report.results:
             # Test status icon (use checkmark for test cases)
-            if result.status == "passed":
+            if result.status is Status.PASSED:
                 test_icon = ":white_check_mark:"
             else:
                 test_icon = ":x:"
@@ -587,9 +834,9 @@ See attached HTML report for details.
             if result.checkpoints:
                 checkpoint_parts = []
                 for cp in result.checkpoints:
-                    if cp.status == "passed":
+                    if cp.status is Status.PASSED:
                         cp_icon = ":large_green_circle:"
-                    elif cp.status == "failed":
+                    elif cp.status is Status.FAILED:
                         cp_icon = ":red_circle:"
                     else:  # skipped
                         cp_icon = ":white_circle:"
@@ -605,7 +852,7 @@ See attached HTML report for details.
                 })
 
             # Add error info for failed tests
-            if result.status != "passed" and result.error_message:
+            if result.status is not Status.PASSED and result.error_message:
                 error_preview = result.error_message[:100].replace('\n', ' ')
                 if len(result.error_message) > 100:
                     error_preview += "..."
@@ -645,7 +892,7 @@ See attached HTML report for details.
 • Duration: {report.total_duration:.1f}s
 """
 
-        failed_tests = [r for r in report.results if r.status != "passed"]
+        failed_tests = [r for r in report.results if r.status is not Status.PASSED]
         if failed_tests:
             text += "\n*Failed Tests:*\n"
             for result in failed_tests[:5]:
@@ -776,24 +1023,16 @@ def extract_checkpoints_from_prompt(prompt: str) -> List[tuple]:
     if not prompt:
         return []
 
-    # Pattern to match "STEP {n}: {description}"
-    pattern = r'STEP\s+(\d+):\s*([^\n]+)'
-    matches = re.findall(pattern, prompt, re.IGNORECASE)
-
-    # Convert to list of tuples and deduplicate
-    steps = []
-    seen_steps = set()
-    for num_str, name in matches:
+    # One pass over the prompt; the first description of each step number wins
+    steps: Dict[int, str] = {}
+    for num_str, name in _PROMPT_STEP_RE.findall(prompt):
         step_num = int(num_str)
-        if step_num not in seen_steps:
+        if step_num not in steps:
             # Clean up the step name (remove trailing punctuation, etc.)
-            clean_name = name.strip().rstrip(':').strip()
-            steps.append((step_num, clean_name))
-            seen_steps.add(step_num)
+            steps[step_num] = name.strip().rstrip(':').strip()
 
     # Sort by step number
-    steps.sort(key=lambda x: x[0])
-    return steps
+    return sorted(steps.items())
 
 
 def get_checkpoints_for_test(
@@ -814,61 +1053,50 @@ def get_checkpoints_for_test(
     Returns:
         List of Checkpoint objects with appropriate status
     """
-    # Try to auto-extract from prompt first
-    if prompt:
-        steps = extract_checkpoints_from_prompt(prompt)
-        if steps:
-            # Successfully extracted from prompt
-            pass
-        else:
-            # Fallback to generic steps
-            steps = _get_fallback_steps(test_name)
-    else:
-        # No prompt provided, use fallback
+    # Try to auto-extract from prompt first, fall back to generic steps
+    steps = extract_checkpoints_from_prompt(prompt) if prompt else []
+    if not steps:
         steps = _get_fallback_steps(test_name)
 
-    # Convert to Checkpoint objects with status
-    checkpoints = []
-    total_steps = len(steps)
-
-    for step_num, step_name in steps:
-        if test_passed:
-            status = "passed"
-        elif last_step > 0:
-            if step_num < last_step:
-                status = "passed"
-            elif step_num == last_step:
-                status = "failed"
-            else:
-                status = "skipped"
-        else:
-            # Unknown failure point - mark last step as failed
-            if step_num == total_steps:
-                status = "failed"
-            else:
-                status = "passed"
+    # Decide the status rule once, then apply it to every step
+    if test_passed:
+        statuses = [Status.PASSED] * len(steps)
+    elif last_step > 0:
+        statuses = [
+            Status.PASSED if step_num < last_step
+            else Status.FAILED if step_num == last_step
+            else Status.SKIPPED
+            for step_num, _ in steps
+        ]
+    else:
+        # Unknown failure point - mark last step as failed
+        total_steps = len(steps)
+        statuses = [
+            Status.FAILED if step_num == total_steps else Status.PASSED
+            for step_num, _ in steps
+        ]
 
-        checkpoints.append(Checkpoint(
-            step=step_num,
-            name=step_name,
-            status=status,
-        ))
+    return [
+        Checkpoint(step=step_num, name=step_name, status=status)
+        for (step_num, step_name), status in zip(steps, statuses)
+    ]
 
-    return checkpoints
 
+# Generic fallback steps (shared, never mutated)
+_FALLBACK_STEPS = (
+    (1, "Login"),
+    (2, "Navigate"),
+    (3, "Execute Task"),
+    (4, "Verify Result"),
+)
 
-def _get_fallback_steps(test_name: str) -> List[tuple]:
+
+def _get_fallback_steps(test_name: str) -> Sequence[Tuple[int, str]]:
     """
     Get fallback steps based on test name keywords.
     Used when prompt is not available for auto-extraction.
     """
-    # Generic fallback steps
-    return [
-        (1, "Login"),
-        (2, "Navigate"),
-        (3, "Execute Task"),
-        (4, "Verify Result"),
-    ]
+    return _FALLBACK_STEPS
 
 
 def extract_last_step_from_result(result: str) -> int:
@@ -877,37 +1105,40 @@ def extract_last_step_from_result(result: str) -> int:
         return 0
 
     # Find all step mentions
-    step_matches = re.findall(r'(?:STEP|Step|step)\s*(\d+)', result)
+    step_matches = _STEP_NUM_RE.findall(result)
     if step_matches:
         return int(step_matches[-1])
     return 0
 
 
+@lru_cache(maxsize=64)
 def analyze_error(error_message: str, result: str = "") -> str:
     """
     Analyze error and provide a summary.
     This is a simple rule-based analysis. Can be enhanced with AI later.
+    Results are memoized, so repeated tracebacks (e.g. reruns) are analyzed once.
     """
     analysis_lines = []
     error_lower = error_message.lower() if error_message else ""
     result_lower = result.lower() if result else ""
 
-    # Common error patterns
-    if "timeout" in error_lower:
+    # Common error patterns (all keywords collected in one scan)
+    hits = set(_ERR_KEYWORD_RE.findall(error_lower))
+    if "timeout" in hits:
         analysis_lines.append("• Page load or element wait timeout")
-    if "element" in error_lower and ("not found" in error_lower or "not visible" in error_lower):
+    if "element" in hits and ("not found" in hits or "not visible" in hits):
         analysis_lines.append("• UI element not found - selector may have changed")
-    if "login" in error_lower or "auth" in error_lower:
+    if "login" in hits or "auth" in hits:
         analysis_lines.append("• Authentication issue - check credentials")
-    if "upload" in error_lower or "file" in error_lower:
+    if "upload" in hits or "file" in hits:
         analysis_lines.append("• File upload failed - check file path and format")
-    if "click" in error_lower:
+    if "click" in hits:
         analysis_lines.append("• Click action failed - element may be obscured")
-    if "network" in error_lower or "connection" in error_lower:
+    if "network" in hits or "connection" in hits:
         analysis_lines.append("• Network connectivity issue")
 
     # Try to identify which step failed
-    step_matches = re.findall(r'(?:step|STEP)\s*(\d+)', result_lower)
+    step_matches = _LOWER_STEP_NUM_RE.findall(result_lower)
     if step_matches:
         last_step = step_matches[-1]
         analysis_lines.append(f"• Failed at or after Step {last_step}")
@@ -923,23 +1154,22 @@ def extract_key_error_log(error_message: str, max_lines: int = 5) -> str:
     if not error_message:
         return ""
 
-    lines = error_message.strip().split('\n')
-
-    # Priority keywords for relevant lines
-    priority_keywords = ['error', 'failed', 'exception', 'timeout', 'not found', 'assert']
+    error_message = error_message.strip()
 
-    # Find lines with priority keywords
+    # Find lines with priority keywords (see _PRIORITY_RE), stopping at max_lines
     priority_lines = []
-    for line in lines:
-        line_lower = line.lower()
-        if any(kw in line_lower for kw in priority_keywords):
+    for line in io.StringIO(error_message):
+        if _PRIORITY_RE.search(line):
             priority_lines.append(line.strip())
+            if len(priority_lines) >= max_lines:
+                break
 
     # Return priority lines if found, otherwise first/last lines
     if priority_lines:
-        return '\n'.join(priority_lines[:max_lines])
+        return '\n'.join(priority_lines)
     else:
         # Return first and last lines
+        lines = error_message.split('\n')
         if len(lines) <= max_lines:
             return '\n'.join(lines)
         else:
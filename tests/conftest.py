@@ -1,10 +1,13 @@
 """
 Pytest configuration and fixtures for AdWave tests.
 """
+import itertools
 import os
+import re
 import sys
 import time
 from datetime import datetime
+from functools import lru_cache
 
 import pytest
 from dotenv import load_dotenv
@@ -19,6 +22,7 @@ from core.reporter import (
     TestResult,
     ReportGenerator,
     Checkpoint,
+    Status,
     get_checkpoints_for_test,
     extract_last_step_from_result,
     analyze_error,
@@ -26,6 +30,30 @@ from core.reporter import (
 )
 
 
+# Error line outside pytest's source (">") and explanation ("E ") lines
+_ACTUAL_ERROR_RE = re.compile(
+    r'^[^\S\n]*+(?!>|E )([^\n]*?(?:Error|Exception|(?i:assert))[^\n]*)$',
+    re.MULTILINE,
+)
+# pytest explanation lines: "E   <message>"
+_ASSERTION_LINE_RE = re.compile(r'^[^\S\n]*E (.*\S.*)$', re.MULTILINE)
+# Failure categories (case-insensitive keywords); "success"/"false" refine assertions.
+# Lookahead alternatives so overlapping keywords are all found
+_CATEGORY_RE = re.compile(
+    r'(?=(?P<assertion>assert)|(?P<timeout>timeout)|(?P<not_found>(?-i:ElementNotFound)|not found)'
+    r'|(?P<connection>connection)|(?P<login>login)|(?P<success>success)|(?P<false>false))',
+    re.IGNORECASE,
+)
+_CATEGORY_PRIORITY = ("assertion", "timeout", "not_found", "connection", "login")
+_CATEGORY_ANALYSIS = {
+    "timeout": "Page or element loading timed out. The page may be slow or the element may not exist.",
+    "not_found": "Expected element was not found on the page. Page structure may have changed.",
+    "connection": "Network connection error. Check if the target URL is accessible.",
+    "login": "Login process failed. Check credentials or login page structure.",
+}
+
+
+@lru_cache(maxsize=64)
 def _generate_error_analysis(test_name: str, error_text: str, has_screenshot: bool) -> str:
     """
     Generate AI analysis of test failure.
@@ -33,42 +61,28 @@ def _generate_error_analysis(test_name: str, error_text: str, has_screenshot: bo
     Instead of showing raw error logs, this function provides a human-readable
     analysis of what went wrong.
     """
-    # Extract key error information
-    error_lines = error_text.strip().split("\n")
-
-    # Find the actual error message (usually at the end)
-    actual_error = ""
-    for line in reversed(error_lines):
-        line = line.strip()
-        if line and not line.startswith(">") and not line.startswith("E "):
-            if "Error" in line or "Exception" in line or "assert" in line.lower():
-                actual_error = line
-                break
-
-    # Find assertion errors
-    assertion_info = ""
-    for line in error_lines:
-        if line.strip().startswith("E "):
-            assertion_info += line.strip()[2:] + " "
+    # Find the actual error message (the last matching line, usually at the end)
+    error_matches = _ACTUAL_ERROR_RE.findall(error_text)
+    actual_error = error_matches[-1].strip() if error_matches else ""
 
     # Generate concise analysis
     analysis_parts = []
 
-    if "AssertionError" in error_text or "assert" in error_text.lower():
-        if "success" in error_text.lower() and "false" in error_text.lower():
+    # One scan collects every category keyword; the first in priority order wins
+    found = {match.lastgroup for match in _CATEGORY_RE.finditer(error_text)}
+    category = next((name for name in _CATEGORY_PRIORITY if name in found), None)
+
+    if category == "assertion":
+        # Find assertion errors
+        assertion_info = "".join(line.rstrip() + " " for line in _ASSERTION_LINE_RE.findall(error_text))
+        if "success" in found and "false" in found:
             analysis_parts.append("Test verification failed - expected elements or conditions were not met on the page.")
         elif assertion_info:
             analysis_parts.append(f"Assertion failed: {assertion_info.strip()}")
         else:
             analysis_parts.append("Test assertion failed during verification.")
-    elif "TimeoutError" in error_text or "timeout" in error_text.lower():
-        analysis_parts.append("Page or element loading timed out. The page may be slow or the element may not exist.")
-    elif "ElementNotFound" in error_text or "not found" in error_text.lower():
-        analysis_parts.append("Expected element was not found on the page. Page structure may have changed.")
-    elif "ConnectionError" in error_text or "connection" in error_text.lower():
-        analysis_parts.append("Network connection error. Check if the target URL is accessible.")
-    elif "LoginError" in error_text or "login" in error_text.lower():
-        analysis_parts.append("Login process failed. Check credentials or login page structure.")
+    elif category:
+        analysis_parts.append(_CATEGORY_ANALYSIS[category])
     else:
         analysis_parts.append(f"Test encountered an error: {actual_error or 'Unknown error'}")
 
@@ -86,33 +100,71 @@ TEST_ORDER = [
     "test_create_campaign[Campaign_Pop]",
     "test_create_campaign[Campaign_Display]",
     "test_create_campaign[Campaign_Native]",
-    # Creative tests (parametrized upload + delete)
-    "test_upload_creative[Upload_Push]",
-    "test_upload_creative[Upload_Display]",
-    "test_upload_creative[Upload_Native]",
+    # Creative tests (batched upload + delete)
+    "test_upload_all_creatives",
     "test_delete_creatives",
     # Audience test
     "test_create_audience",
     # Registration test (requires GMAIL_ADDRESS + GMAIL_APP_PASSWORD)
     "test_register_new_account",
 ]
+_ORDER_INDEX = {name: i for i, name in enumerate(TEST_ORDER)}
 
 
 def pytest_collection_modifyitems(items):
     """Sort tests according to predefined order."""
     def get_order(item):
-        try:
-            return TEST_ORDER.index(item.name)
-        except ValueError:
-            return len(TEST_ORDER)  # Unknown tests go last
+        return _ORDER_INDEX.get(item.name, len(TEST_ORDER))  # Unknown tests go last
 
     items.sort(key=get_order)
 
 
+# Minimum gap between LLM-driven tests for API rate limit cooldown (seconds),
+# overridable with --llm-cooldown or the PYTEST_LLM_COOLDOWN / LLM_COOLDOWN_SEC
+# environment variables (in that order of precedence)
+DEFAULT_LLM_COOLDOWN_SEC = 10
+# Hosted providers with API rate limits; local models (ollama) need no cooldown
+RATE_LIMITED_PROVIDERS = frozenset({"openai", "claude", "gemini"})
+
+
+def _resolve_llm_cooldown(config) -> float:
+    """Resolve the LLM cooldown from --llm-cooldown, the environment or the default."""
+    cooldown = config.getoption("--llm-cooldown")
+    source = "--llm-cooldown"
+    if cooldown is None:
+        for name in ("PYTEST_LLM_COOLDOWN", "LLM_COOLDOWN_SEC"):
+            value = os.getenv(name)
+            if value:
+                try:
+                    cooldown = float(value)
+                except ValueError:
+                    raise pytest.UsageError(f"{name} must be a number of seconds, got {value!r}") from None
+                source = name
+                break
+        else:
+            return float(DEFAULT_LLM_COOLDOWN_SEC)
+    if cooldown < 0:
+        raise pytest.UsageError(f"{source} must not be negative, got {cooldown}")
+    return cooldown
+
+
 def pytest_runtest_teardown(item, nextitem):
-    """Add delay between tests for API rate limit cooldown."""
-    if nextitem is not None:
-        time.sleep(10)
+    """Wait out the remaining API rate limit cooldown before the next LLM-driven test."""
+    if nextitem is None or nextitem.get_closest_marker("no_cooldown"):
+        return
+    if "browser_agent" not in nextitem.fixturenames:
+        return  # Next test does not call the LLM
+
+    agent = item.funcargs.get("browser_agent")
+    last_call_ts = agent.last_llm_call_ts if agent else None
+    if last_call_ts is None:
+        return  # This test did not call the LLM
+    if agent.config.llm_config.provider not in RATE_LIMITED_PROVIDERS:
+        return
+
+    remaining = item.config._llm_cooldown - (time.monotonic() - last_call_ts)
+    if remaining > 0:
+        time.sleep(remaining)
 
 
 def pytest_addoption(parser):
@@ -165,6 +217,36 @@ def pytest_addoption(parser):
         default=False,
         help="Send report to Slack (requires SLACK_BOT_TOKEN and SLACK_CHANNEL in .env)",
     )
+    parser.addoption(
+        "--reuse-browser",
+        action="store_true",
+        default=False,
+        help="Keep one logged-in browser open across tests instead of a fresh browser per task",
+    )
+    parser.addoption(
+        "--llm-cooldown",
+        action="store",
+        type=float,
+        default=None,
+        help="Minimum seconds between LLM-driven tests (overrides LLM_COOLDOWN_SEC, 0 disables)",
+    )
+
+
+# Config per (env, llm_provider, llm_model); shared by pytest_sessionstart and the config fixture
+_CONFIG_CACHE: dict[tuple, Config] = {}
+
+
+def _get_config(env: str, llm_provider: str, llm_model: str) -> Config:
+    """Build the Config for these options once and reuse it."""
+    key = (env, llm_provider, llm_model)
+    cfg = _CONFIG_CACHE.get(key)
+    if cfg is None:
+        cfg = _CONFIG_CACHE[key] = Config(
+            env=env,
+            llm_provider=llm_provider,
+            llm_model=llm_model,
+        )
+    return cfg
 
 
 @pytest.fixture(scope="session")
@@ -194,38 +276,58 @@ def llm_model(request) -> str:
 @pytest.fixture(scope="session")
 def config(test_env, llm_provider, llm_model) -> Config:
     """Create test configuration."""
-    # Load environment variables
-    load_dotenv()
+    return _get_config(test_env, llm_provider, llm_model)
 
-    return Config(
-        env=test_env,
-        llm_provider=llm_provider,
-        llm_model=llm_model,
+
+@pytest.fixture(scope="session")
+async def browser_agent(config, headless, request) -> AdWaveBrowserAgent:
+    """Create a browser agent shared by all tests (LLM client is created once)."""
+    # No user_data_dir: browser-use gives each browser session its own temp profile,
+    # which also keeps pytest-xdist workers apart
+    agent = AdWaveBrowserAgent(
+        config=config,
+        headless=headless,
+        reuse_browser=request.config.getoption("--reuse-browser"),
     )
+    yield agent
+    await agent.close_browser()
+    if agent.gmail_helper:
+        agent.gmail_helper.close()
 
 
-@pytest.fixture(scope="function")
-def browser_agent(config, headless) -> AdWaveBrowserAgent:
-    """Create a browser agent for testing."""
-    return AdWaveBrowserAgent(config=config, headless=headless)
+@pytest.fixture(scope="session")
+def name_factory():
+    """
+    Make unique names for created entities: "<HHMMSS_YYYYMMDD>_<n>_<suffix>".
 
+    The timestamp is taken once per session and a counter keeps names unique
+    within it; under pytest-xdist the worker id is added (e.g. "_gw1-0_").
+    """
+    timestamp = datetime.now().strftime("%H%M%S_%Y%m%d")
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    prefix = f"{timestamp}_{worker}-" if worker else f"{timestamp}_"
+    counter = itertools.count()
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create event loop for async tests."""
-    import asyncio
+    def make(suffix: str) -> str:
+        return f"{prefix}{next(counter)}_{suffix}"
+
+    return make
 
-    if sys.platform == "win32":
-        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
-    loop = asyncio.new_event_loop()
-    yield loop
-    loop.close()
+@pytest.fixture(autouse=True)
+def _reset_browser_agent(request):
+    """Clear the shared browser agent's per-test state after each test that uses it."""
+    yield
+    if "browser_agent" in request.fixturenames:
+        request.getfixturevalue("browser_agent").reset_state()
 
 
 # Report generation hooks
 def pytest_configure(config):
     """Initialize report data at start of test session."""
+    # Load environment variables once, before any Config is built
+    load_dotenv()
+
     config._test_report = TestReport(
         start_time=datetime.now(),
         environment=config.getoption("--env"),
@@ -235,6 +337,35 @@ def pytest_configure(config):
     reports_dir = os.path.join(project_root, config.getoption("--report-dir"))
     config._report_generator = ReportGenerator(output_dir=reports_dir)
     config._current_screenshot = None
+    # Validated once here, so a bad value fails the run up front
+    config._llm_cooldown = _resolve_llm_cooldown(config)
+    if config.pluginmanager.hasplugin("xdist") and not _is_xdist_worker(config):
+        config.pluginmanager.register(_WorkerResultCollector(config._test_report), "adwave-worker-results")
+
+
+# report.user_properties key carrying a TestResult from a pytest-xdist worker
+_RESULT_PROPERTY = "adwave_test_result"
+
+
+def _is_xdist_worker(config) -> bool:
+    """True inside a pytest-xdist worker process."""
+    return hasattr(config, "workerinput")
+
+
+class _WorkerResultCollector:
+    """Collects TestResults sent by pytest-xdist workers into the controller's report."""
+
+    def __init__(self, test_report: TestReport):
+        self.test_report = test_report
+
+    def pytest_runtest_logreport(self, report):
+        for name, value in report.user_properties:
+            if name == _RESULT_PROPERTY:
+                self.test_report.results.append(TestResult.from_dict(value))
+
+
+# Report module name per test file nodeid
+_MODULE_CACHE: dict[str, str] = {}
 
 
 @pytest.hookimpl(hookwrapper=True)
@@ -249,18 +380,21 @@ def pytest_runtest_makereport(item, call):
 
         # Determine test status
         if report.passed:
-            status = "passed"
+            status = Status.PASSED
         elif report.failed:
-            status = "failed"
+            status = Status.FAILED
         else:
-            status = "error"
+            status = Status.ERROR
 
-        # Get module name from test path
-        module = item.module.__name__.split(".")[-1] if item.module else "unknown"
+        # Get module name from test path (once per test file)
+        module_key = item.nodeid.partition("::")[0]
+        module = _MODULE_CACHE.get(module_key)
+        if module is None:
+            module = _MODULE_CACHE[module_key] = item.module.__name__.rpartition(".")[2] if item.module else "unknown"
 
         # Initialize variables
-        screenshot_base64 = None
-        final_screenshot_base64 = None
+        screenshot_url = None
+        final_screenshot_url = None
         checkpoints = []
         error_message = ""
         error_analysis = None
@@ -275,31 +409,23 @@ def pytest_runtest_makereport(item, call):
                 if last_result:
                     last_step = extract_last_step_from_result(last_result)
 
-                if status == "passed":
+                if not config.getoption("--report"):
+                    pass  # Screenshots are only used by the HTML report
+                elif status is Status.PASSED:
                     # Get final screenshot on success
                     final_data = browser_agent.get_final_screenshot()
                     if final_data:
-                        if isinstance(final_data, str):
-                            final_screenshot_base64 = final_data
-                        else:
-                            final_screenshot_base64 = config._report_generator.screenshot_to_base64(
-                                final_data
-                            )
+                        final_screenshot_url = config._report_generator.save_screenshot(final_data)
                 else:
                     # Get error screenshot on failure
                     error_data = browser_agent.get_last_screenshot()
                     if error_data:
-                        if isinstance(error_data, str):
-                            screenshot_base64 = error_data
-                        else:
-                            screenshot_base64 = config._report_generator.screenshot_to_base64(
-                                error_data
-                            )
+                        screenshot_url = config._report_generator.save_screenshot(error_data)
         except Exception:
             pass  # Report data collection not critical
 
         # Generate error analysis for failed tests
-        if status in ("failed", "error") and report.longrepr:
+        if status is not Status.PASSED and report.longrepr:
             error_text = str(report.longrepr)
             error_message = extract_key_error_log(error_text)
             error_analysis = analyze_error(error_text, browser_agent.get_last_result() if browser_agent else "")
@@ -308,7 +434,7 @@ def pytest_runtest_makereport(item, call):
         last_prompt = browser_agent.get_last_prompt() if browser_agent else None
 
         # Generate checkpoints - auto-extracted from prompt if available
-        test_passed = (status == "passed")
+        test_passed = status is Status.PASSED
         checkpoints = get_checkpoints_for_test(item.name, test_passed, last_step, prompt=last_prompt)
 
         # Create test result with all data
@@ -319,23 +445,26 @@ def pytest_runtest_makereport(item, call):
             duration=report.duration,
             error_message=error_message,
             error_analysis=error_analysis,
-            screenshot_base64=screenshot_base64,
-            final_screenshot_base64=final_screenshot_base64,
+            screenshot_url=screenshot_url,
+            final_screenshot_url=final_screenshot_url,
             checkpoints=checkpoints,
         )
 
-        config._test_report.results.append(test_result)
+        if _is_xdist_worker(config):
+            # Sent to the controller, which builds the report (see _WorkerResultCollector)
+            report.user_properties.append((_RESULT_PROPERTY, test_result.to_dict()))
+        else:
+            config._test_report.results.append(test_result)
 
 
 def pytest_sessionstart(session):
     """Called after Session object is created."""
     # Load config to get LLM info
-    load_dotenv()
     try:
-        cfg = Config(
-            env=session.config.getoption("--env"),
-            llm_provider=session.config.getoption("--llm"),
-            llm_model=session.config.getoption("--model"),
+        cfg = _get_config(
+            session.config.getoption("--env"),
+            session.config.getoption("--llm"),
+            session.config.getoption("--model"),
         )
         session.config._test_report.llm_provider = cfg.llm_config.provider
         session.config._test_report.llm_model = cfg.llm_config.model
@@ -345,6 +474,12 @@ def pytest_sessionstart(session):
 
 def pytest_sessionfinish(session, exitstatus):
     """Generate report at end of test session."""
+    # Make sure every screenshot queued during the run is on disk
+    session.config._report_generator.flush_screenshots()
+
+    if _is_xdist_worker(session.config):
+        return  # The controller generates the report from all workers' results
+
     if session.config.getoption("--report"):
         report = session.config._test_report
         report.end_time = datetime.now()
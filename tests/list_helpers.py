@@ -0,0 +1,45 @@
+"""
+Shared helper functions for name lists in agent results.
+
+Task prompts ask the agent to print names one per line between
+<KIND>_LIST_START / <KIND>_LIST_END markers (e.g. CAMPAIGN_LIST_START).
+"""
+import re
+from functools import lru_cache
+
+# One name per non-blank line
+_LIST_LINE_RE = re.compile(r'[^\s][^\n]*')
+
+
+@lru_cache(maxsize=None)
+def _list_re(kind: str) -> re.Pattern:
+    """Compile the marker regex for a list kind (once per kind)."""
+    kind = re.escape(kind)
+    return re.compile(
+        rf'{kind}_list_start\s*(.*?)\s*{kind}_list_end',
+        re.DOTALL | re.IGNORECASE
+    )
+
+
+def extract_marked_list(result: str, kind: str) -> list[str]:
+    """Extract names from agent result between <KIND>_LIST markers."""
+    match = _list_re(kind).search(result)
+
+    if match:
+        return [line.strip() for line in _LIST_LINE_RE.findall(match.group(1))]
+
+    return []
+
+
+def verify_name_in_list(result: str, kind: str, name: str) -> bool:
+    """Check if name exists in the <KIND>_LIST of the agent result."""
+    name_lower = name.lower()
+
+    # Check if any listed name matches (partial match for truncation)
+    for listed in extract_marked_list(result, kind):
+        listed = listed.lower()
+        if name_lower in listed or listed in name_lower:
+            return True
+
+    # Also check if the name appears anywhere in the result
+    return name_lower in result.lower()
@@ -6,6 +6,60 @@ Provides utilities for parsing agent results and verifying registration outcomes
 import re
 from typing import Optional
 
+# Markers emitted by the registration task prompt
+_EMAIL_RE = re.compile(r'REGISTRATION_EMAIL:\s*(\S+@\S+)')
+_CODE_RE = re.compile(r'VERIFICATION_CODE:\s*([A-Za-z0-9]{4,8})')
+_MESSAGE_RE = re.compile(r'REGISTRATION_MESSAGE:\s*(.+?)(?:\n|$)')
+_RESULT_BLOCK_RE = re.compile(
+    r'REGISTRATION_RESULT_START\s*(.*?)\s*REGISTRATION_RESULT_END',
+    re.DOTALL | re.IGNORECASE
+)
+# Flags inside the result block ("LOGIN_SUCCESS: true" or "LOGIN_SUCCESS:true")
+_BLOCK_LOGIN_RE = re.compile(r'login_success: ?true', re.IGNORECASE)
+_BLOCK_REGISTRATION_RE = re.compile(r'registration_success: ?true', re.IGNORECASE)
+# How much of the end of the agent output to search for the result block first
+_RESULT_TAIL_CHARS = 4096
+_LOGIN_RE = re.compile(r'LOGIN_SUCCESS:\s*(true|false)', re.IGNORECASE)
+_SUCCESS_RE = re.compile(r'REGISTRATION_SUCCESS:\s*(true|false)', re.IGNORECASE)
+
+
+def _keywords_re(keywords: list[str]) -> re.Pattern:
+    """Compile keywords into one case-insensitive alternation (single scan, no lowercased copy)."""
+    return re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+
+# Fallback keywords when no explicit markers are present
+_LOGIN_INDICATORS_RE = _keywords_re([
+    "/campaign",
+    "dashboard",
+    "welcome",
+    "logged in",
+    "login successful",
+    "campaign list",
+    "link your first product",
+    "unlock the power of adwave",
+    "registration and login successful",
+])
+_SUCCESS_KEYWORDS_RE = _keywords_re([
+    "it is all set",
+    "registration completed",
+    "successfully registered",
+    "registration complete",
+    "account created",
+    "let's start your journey",
+])
+
+# All markers above in one pass for get_registration_summary. Each alternative is
+# a lookahead so every marker is found at its first position, exactly as the
+# individual searches would, even when markers share a line.
+_SUMMARY_RE = re.compile(
+    r'(?=REGISTRATION_EMAIL:\s*(?P<email>\S+@\S+)'
+    r'|VERIFICATION_CODE:\s*(?P<code>[A-Za-z0-9]{4,8})'
+    r'|REGISTRATION_MESSAGE:\s*(?P<message>.+?)(?:\n|$)'
+    r'|(?i:LOGIN_SUCCESS):\s*(?P<login>(?i:true|false))'
+    r'|(?i:REGISTRATION_SUCCESS):\s*(?P<registration>(?i:true|false)))'
+)
+
 
 def extract_registration_email(result: str) -> str:
     """
@@ -17,7 +71,7 @@ def extract_registration_email(result: str) -> str:
     Returns:
         Email address used for registration, or empty string if not found
     """
-    match = re.search(r'REGISTRATION_EMAIL:\s*(\S+@\S+)', result)
+    match = _EMAIL_RE.search(result)
     return match.group(1) if match else ""
 
 
@@ -31,7 +85,7 @@ def extract_verification_code(result: str) -> str:
     Returns:
         Verification code, or empty string if not found
     """
-    match = re.search(r'VERIFICATION_CODE:\s*([A-Za-z0-9]{4,8})', result)
+    match = _CODE_RE.search(result)
     return match.group(1) if match else ""
 
 
@@ -45,10 +99,60 @@ def extract_registration_message(result: str) -> str:
     Returns:
         Status message, or empty string if not found
     """
-    match = re.search(r'REGISTRATION_MESSAGE:\s*(.+?)(?:\n|$)', result)
+    match = _MESSAGE_RE.search(result)
     return match.group(1).strip() if match else ""
 
 
+def _result_block(result: str) -> str:
+    """Return the REGISTRATION_RESULT_START block content, or empty string."""
+    # The block is normally the agent's final output: search the tail first
+    tail_start = len(result) - _RESULT_TAIL_CHARS
+    match = _RESULT_BLOCK_RE.search(result, tail_start) if tail_start > 0 else None
+    if match is None:
+        match = _RESULT_BLOCK_RE.search(result)
+    return match.group(1) if match else ""
+
+
+def _login_success(result: str, block_content: str, login_marker: Optional[str]) -> bool:
+    """Decide login success from the result block, LOGIN_SUCCESS marker or keywords."""
+    # Check for new format: REGISTRATION_RESULT_START block
+    if _BLOCK_LOGIN_RE.search(block_content):
+        return True
+
+    # Check for explicit login success marker
+    if login_marker:
+        return login_marker.lower() == "true"
+
+    # Fallback: check for indicators of successful login
+    return _LOGIN_INDICATORS_RE.search(result) is not None
+
+
+def _registration_success(
+    result: str,
+    block_content: str,
+    success_marker: Optional[str],
+    login_success: bool,
+) -> bool:
+    """Decide registration success from the result block, REGISTRATION_SUCCESS marker or keywords."""
+    # Check for new format: REGISTRATION_RESULT_START block
+    if _BLOCK_REGISTRATION_RE.search(block_content) and _BLOCK_LOGIN_RE.search(block_content):
+        return True
+
+    # Check for explicit success/failure marker
+    if success_marker:
+        # If registration reported success, also check login
+        return success_marker.lower() == "true" and login_success
+
+    # Fallback: check for common success indicators
+    if _SUCCESS_KEYWORDS_RE.search(result):
+        # Also verify login succeeded
+        return login_success
+
+    # Failure indicators ("invalid", "already exists", ...) and unclear results
+    # are both treated as failure
+    return False
+
+
 def verify_login_success(result: str) -> bool:
     """
     Verify login with new account was successful.
@@ -59,40 +163,8 @@ def verify_login_success(result: str) -> bool:
     Returns:
         True if login appears successful, False otherwise
     """
-    # Check for new format: REGISTRATION_RESULT_START block
-    result_block = re.search(
-        r'REGISTRATION_RESULT_START\s*(.*?)\s*REGISTRATION_RESULT_END',
-        result, re.DOTALL | re.IGNORECASE
-    )
-    if result_block:
-        block_content = result_block.group(1).lower()
-        if "login_success: true" in block_content or "login_success:true" in block_content:
-            return True
-
-    # Check for explicit login success marker
-    login_match = re.search(r'LOGIN_SUCCESS:\s*(true|false)', result.lower())
-    if login_match:
-        return login_match.group(1) == "true"
-
-    # Fallback: check for indicators of successful login
-    result_lower = result.lower()
-    success_indicators = [
-        "/campaign",
-        "dashboard",
-        "welcome",
-        "logged in",
-        "login successful",
-        "campaign list",
-        "link your first product",
-        "unlock the power of adwave",
-        "registration and login successful",
-    ]
-
-    for indicator in success_indicators:
-        if indicator in result_lower:
-            return True
-
-    return False
+    login_match = _LOGIN_RE.search(result)
+    return _login_success(result, _result_block(result), login_match.group(1) if login_match else None)
 
 
 def verify_registration_success(result: str) -> bool:
@@ -109,75 +181,46 @@ def verify_registration_success(result: str) -> bool:
     Returns:
         True if registration appears successful, False otherwise
     """
-    # Check for new format: REGISTRATION_RESULT_START block
-    result_block = re.search(
-        r'REGISTRATION_RESULT_START\s*(.*?)\s*REGISTRATION_RESULT_END',
-        result, re.DOTALL | re.IGNORECASE
+    block_content = _result_block(result)
+    success_match = _SUCCESS_RE.search(result)
+    login_match = _LOGIN_RE.search(result)
+    login_success = _login_success(result, block_content, login_match.group(1) if login_match else None)
+    return _registration_success(
+        result, block_content, success_match.group(1) if success_match else None, login_success
     )
-    if result_block:
-        block_content = result_block.group(1).lower()
-        reg_success = "registration_success: true" in block_content or "registration_success:true" in block_content
-        login_success = "login_success: true" in block_content or "login_success:true" in block_content
-        if reg_success and login_success:
-            return True
-
-    # Check for explicit success/failure marker
-    success_match = re.search(r'REGISTRATION_SUCCESS:\s*(true|false)', result.lower())
-    if success_match:
-        explicit_success = success_match.group(1) == "true"
-        # If registration reported success, also check login
-        if explicit_success:
-            return verify_login_success(result)
-        return False
-
-    # Fallback: check for common success indicators
-    success_keywords = [
-        "it is all set",
-        "registration completed",
-        "successfully registered",
-        "registration complete",
-        "account created",
-        "let's start your journey",
-    ]
-
-    result_lower = result.lower()
-    for keyword in success_keywords:
-        if keyword in result_lower:
-            # Also verify login succeeded
-            return verify_login_success(result)
-
-    # Check for failure indicators
-    failure_keywords = [
-        "failed to receive verification",
-        "registration failed",
-        "invalid",
-        "already exists",
-        "email taken",
-        "error occurred",
-    ]
-
-    for keyword in failure_keywords:
-        if keyword in result_lower:
-            return False
-
-    # Default to False if unclear
-    return False
 
 
 def get_registration_summary(result: str) -> dict:
     """
     Extract a complete summary of the registration attempt.
 
+    Scans the result once for all markers (see _SUMMARY_RE) instead of
+    running each extractor separately.
+
     Args:
         result: Full result string from browser agent
 
     Returns:
         Dictionary with email, code, registration success, login success, and message
     """
+    markers = {}
+    for match in _SUMMARY_RE.finditer(result):
+        kind = match.lastgroup
+        if kind not in markers:
+            markers[kind] = match.group(kind)
+            if len(markers) == 5:
+                break
+
+    block_content = _result_block(result)
+    login_success = _login_success(result, block_content, markers.get("login"))
+    message = markers.get("message")
+
     return {
-        "email": extract_registration_email(result),
-        "verification_code": extract_verification_code(result),
-        "registration_success": verify_registration_success(result),
-        "login_success": verify_login_success(result),
-        "message": extract_registration_message(result),
+        "email": markers.get("email", ""),
+        "verification_code": markers.get("code", ""),
+        "registration_success": _registration_success(
+            result, block_content, markers.get("registration"), login_success
+        ),
+        "login_success": login_success,
+        "message": message.strip() if message else "",
     }
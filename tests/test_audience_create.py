@@ -1,45 +1,24 @@
 """
 P1 Functional Test: Create Audience Segment
 """
-import re
 import pytest
-from datetime import datetime
+from .list_helpers import extract_marked_list, verify_name_in_list
 
 
 def extract_audience_list(result: str) -> list[str]:
     """Extract audience names from agent result using AUDIENCE_LIST markers."""
-    result_lower = result.lower()
-
-    match = re.search(
-        r'audience_list_start\s*(.*?)\s*audience_list_end',
-        result_lower,
-        re.DOTALL
-    )
-
-    if match:
-        names = [name.strip() for name in match.group(1).strip().split('\n') if name.strip()]
-        return names
-
-    return []
+    return extract_marked_list(result, "audience")
 
 
 def verify_audience_in_list(result: str, audience_name: str) -> bool:
     """Check if audience name exists in the extracted audience list."""
-    audience_list = extract_audience_list(result)
-    audience_name_lower = audience_name.lower()
-
-    for audience in audience_list:
-        if audience_name_lower in audience or audience in audience_name_lower:
-            return True
-
-    return audience_name_lower in result.lower()
+    return verify_name_in_list(result, "audience", audience_name)
 
 
 @pytest.mark.asyncio
-async def test_create_audience(browser_agent, config):
+async def test_create_audience(browser_agent, config, name_factory):
     """Test creating a new audience segment."""
-    timestamp = datetime.now().strftime("%H%M%S_%Y%m%d")
-    audience_name = f"{timestamp}_Audience"
+    audience_name = name_factory("Audience")
 
     result = await browser_agent.create_audience(
         audience_name=audience_name,
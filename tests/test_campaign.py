@@ -8,17 +8,17 @@ Tests campaign creation for all supported ad formats:
 - Native: Native advertising format
 """
 import pytest
-from datetime import datetime
 from .campaign_helpers import extract_campaign_list, verify_campaign_in_list
 
 
 # Ad formats to test
-AD_FORMATS = ["Push", "Pop", "Display", "Native"]
+AD_FORMATS = ("Push", "Pop", "Display", "Native")
+_AD_FORMAT_IDS = tuple(f"Campaign_{ad_format}" for ad_format in AD_FORMATS)
 
 
-@pytest.mark.parametrize("ad_format", AD_FORMATS, ids=lambda x: f"Campaign_{x}")
+@pytest.mark.parametrize("ad_format", AD_FORMATS, ids=_AD_FORMAT_IDS)
 @pytest.mark.asyncio
-async def test_create_campaign(browser_agent, config, ad_format):
+async def test_create_campaign(browser_agent, config, name_factory, ad_format):
     """
     Test creating a campaign for the specified ad format.
 
@@ -28,11 +28,11 @@ async def test_create_campaign(browser_agent, config, ad_format):
     Args:
         browser_agent: Browser automation agent fixture
         config: Test configuration fixture
+        name_factory: Unique name generator fixture
         ad_format: The ad format to test (Push, Pop, Display, Native)
     """
     # Generate unique campaign name with timestamp and format
-    timestamp = datetime.now().strftime("%H%M%S_%Y%m%d")
-    campaign_name = f"{timestamp}_{ad_format}"
+    campaign_name = name_factory(ad_format)
 
     # Create campaign using browser agent
     result = await browser_agent.create_campaign(
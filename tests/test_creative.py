@@ -2,58 +2,47 @@
 P1 Functional Test: Creative Management (Upload & Delete)
 
 Tests creative operations for all supported ad formats:
-- Upload Push: Push notification creatives (requires 2 images: icon + banner)
-- Upload Display: Banner display creatives
-- Upload Native: Native advertising creatives
+- Upload: Push (icon + banner), Display and Native creatives in one task
 - Delete: Remove all test creatives
 """
 import pytest
-from .creative_helpers import extract_creative_counts, verify_creative_upload
+from .creative_helpers import CREATIVES_TO_DELETE, parse_creative_result
 
 
 # Ad formats for creative upload (Note: Pop format doesn't have creatives)
-AD_FORMATS = ["Push", "Display", "Native"]
+AD_FORMATS = ("Push", "Display", "Native")
 
-# Creative names to delete (must match exactly what was uploaded)
-CREATIVES_TO_DELETE = [
-    "main_492x328.png - PUSH",
-    "display_250x250.png",
-    "main_492x328.png",
-]
 
-
-@pytest.mark.parametrize("ad_format", AD_FORMATS, ids=lambda x: f"Upload_{x}")
 @pytest.mark.asyncio
-async def test_upload_creative(browser_agent, config, ad_format):
+async def test_upload_all_creatives(browser_agent, config):
     """
-    Test uploading a creative for the specified ad format.
+    Test uploading one creative per ad format in a single browser task.
 
-    This parametrized test runs once for each ad format, uploading a creative
-    and verifying the upload was successful.
+    All formats are uploaded after one login and navigation, and the
+    creative count must grow by exactly the number of formats.
 
     Args:
         browser_agent: Browser automation agent fixture
         config: Test configuration fixture
-        ad_format: The ad format to test (Push, Display, Native)
     """
-    # Upload creative using browser agent
-    result = await browser_agent.create_creative(ad_format=ad_format)
+    # Upload all creatives using browser agent
+    result = await browser_agent.create_creatives(ad_formats=AD_FORMATS)
 
-    # Extract counts for debugging
-    before_count, after_count = extract_creative_counts(result)
+    # Parse counts once for verification and debugging
+    res = parse_creative_result(result)
 
-    # Verify upload success (after_count > before_count)
-    upload_success = verify_creative_upload(result)
+    # Verify upload success (after_count - before_count == number of formats)
+    upload_success = res.success and res.after_count - res.before_count == len(AD_FORMATS)
 
     # Provide detailed error message if verification fails
     if not upload_success:
         pytest.fail(
-            f"{ad_format} creative upload failed.\n"
-            f"Before count: {before_count}, After count: {after_count}\n"
+            f"Creative upload failed for {', '.join(AD_FORMATS)}.\n"
+            f"{res.message}, Expected: +{len(AD_FORMATS)}\n"
             f"Result excerpt: {result[:1500]}..."
         )
 
-    assert upload_success, f"{ad_format} creative upload verification failed"
+    assert upload_success, "Creative upload verification failed"
 
 
 @pytest.mark.asyncio
@@ -61,13 +50,14 @@ async def test_delete_creatives(browser_agent, config):
     """
     Test deleting all test creatives in one task.
 
-    This test runs after all upload tests to clean up the uploaded creatives.
+    This test runs after the upload test to clean up the uploaded creatives.
     It deletes creatives by their exact names.
     """
     result = await browser_agent.delete_creatives(creative_names=CREATIVES_TO_DELETE)
 
     # Extract counts for verification
-    before_count, after_count = extract_creative_counts(result)
+    res = parse_creative_result(result)
+    before_count, after_count = res.before_count, res.after_count
 
     # Strict verification: both counts must be valid
     # No fallback - agent must output counts in the required format
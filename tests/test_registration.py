@@ -15,6 +15,8 @@ Prerequisites:
 - Gmail account configured with App Password
 - Environment variables: GMAIL_ADDRESS/SMTP_USER, GMAIL_APP_PASSWORD/SMTP_PASSWORD
 """
+import logging
+
 import pytest
 
 from .registration_helpers import (
@@ -25,6 +27,8 @@ from .registration_helpers import (
     get_registration_summary,
 )
 
+logger = logging.getLogger(__name__)
+
 
 @pytest.mark.asyncio
 async def test_register_new_account(browser_agent, config):
@@ -71,13 +75,16 @@ async def test_register_new_account(browser_agent, config):
     login_success = summary["login_success"]
     message = summary["message"]
 
-    # Log results for debugging
-    print(f"\nRegistration Summary:")
-    print(f"  Email: {email}")
-    print(f"  Verification Code: {code}")
-    print(f"  Registration Success: {reg_success}")
-    print(f"  Login Success: {login_success}")
-    print(f"  Message: {message}")
+    # Log results for debugging (formatted only when DEBUG logging is enabled)
+    logger.debug(
+        "Registration Summary:\n"
+        "  Email: %s\n"
+        "  Verification Code: %s\n"
+        "  Registration Success: %s\n"
+        "  Login Success: %s\n"
+        "  Message: %s",
+        email, code, reg_success, login_success, message,
+    )
 
     # Verify registration and login succeeded
     if not reg_success:
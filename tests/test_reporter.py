@@ -0,0 +1,96 @@
+"""
+Unit Test: HTML and email reports with missing screenshots
+
+A screenshot whose background write failed (or was deleted) must not stop
+the report from being written or emailed.
+"""
+import base64
+import email
+import smtplib
+from pathlib import Path
+
+import pytest
+
+from core import reporter
+from core.reporter import ReportGenerator, Status
+
+# 1x1 transparent PNG
+PNG_1X1 = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+
+
+def _report_with_missing_shot(generator: ReportGenerator) -> tuple[reporter.TestReport, str, str]:
+    """Build a report of two failed tests whose second screenshot is deleted from disk."""
+    kept_url = generator.save_screenshot(PNG_1X1)
+    missing_url = generator.save_screenshot(PNG_1X1 + b"missing")
+    generator.flush_screenshots()
+    (generator.output_dir / missing_url).unlink()
+
+    # TestReport/TestResult are used via the module so pytest doesn't try to collect them
+    report = reporter.TestReport(results=[
+        reporter.TestResult("test_kept", "Example", Status.FAILED, 1.0, screenshot_url=kept_url),
+        reporter.TestResult("test_missing", "Example", Status.FAILED, 1.0, screenshot_url=missing_url),
+    ])
+    return report, kept_url, missing_url
+
+
+@pytest.mark.parametrize("encoding", ["b64", "a85"])
+def test_save_report_skips_missing_screenshot(tmp_path, encoding):
+    """Inline reports are still written when a screenshot file is missing."""
+    generator = ReportGenerator(str(tmp_path), inline_screenshots=True, screenshot_encoding=encoding)
+    report, kept_url, missing_url = _report_with_missing_shot(generator)
+
+    path = generator.save_report(report, filename="report.html")
+    html = Path(path).read_text(encoding="utf-8")
+
+    if encoding == "b64":
+        assert html.count("data:image/png;base64,") == 1
+        assert "Error Screenshot unavailable" in html
+    else:
+        assert f'id="a85-{Path(kept_url).stem}"' in html
+        assert f'id="a85-{Path(missing_url).stem}"' not in html
+
+
+class _FakeSMTP:
+    """Stand-in for smtplib.SMTP_SSL that keeps the sent message."""
+    sent = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def login(self, *args):
+        pass
+
+    def send_message(self, msg, **kwargs):
+        self.sent.append(msg)
+
+
+def test_send_email_skips_missing_screenshot(tmp_path, monkeypatch):
+    """The email (body and self-contained attachment) is still built and sent."""
+    generator = ReportGenerator(str(tmp_path))
+    report, _, _ = _report_with_missing_shot(generator)
+    monkeypatch.setattr(smtplib, "SMTP_SSL", _FakeSMTP)
+    _FakeSMTP.sent.clear()
+
+    assert generator.send_email(
+        report, str(tmp_path / "report.html"), "to@example.com",
+        "smtp.example.com", 465, "user@example.com", "password",
+    )
+
+    msg = email.message_from_bytes(_FakeSMTP.sent[0].as_bytes())
+    inline_images = [part for part in msg.walk() if part.get_content_type() == "image/png"]
+    attachment = next(
+        part for part in msg.walk()
+        if (part.get("Content-Disposition") or "").startswith("attachment")
+    )
+    attachment_html = attachment.get_payload(decode=True).decode("utf-8")
+    assert len(inline_images) == 1
+    assert attachment_html.count("data:image/png;base64,") == 1
+    assert "Error Screenshot unavailable" in attachment_html